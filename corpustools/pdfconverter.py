@@ -25,8 +25,11 @@ import lxml.etree as etree
 
 from corpustools import basicconverter, util, xslsetter
 
-LETTER_AT_START = re.compile(r"[^\W\d_].*", re.UNICODE)
-LETTER_HYPHEN_AT_END = re.compile(r".*[^\W\d_]-$", re.UNICODE)
+PAGE_DIVS = etree.XPath('//div[starts-with(@id, "page")]')
+HTML_PARSER = etree.HTMLParser()
+CONTROL_CHARS = "\x00-\x08\x0B-\x0C\x0E-\x1F\x7F"
+CONTROL_CHARS_RE = re.compile(f"[{CONTROL_CHARS}]")
+LINK_START_RE = re.compile("<a [^>]+>")
 
 
 def styles(page_style):
@@ -55,12 +58,26 @@ def merge(first, second):
             else:
                 first.text = second.text
 
-    for child in second:
-        first.append(child)
+    first.extend(second)
 
     return first
 
 
+def is_letter(char):
+    """Check if char is a letter.
+
+    This is the same test as the regex class [^\\W\\d_], without
+    invoking the regex engine.
+
+    Args:
+        char (str): a single character
+
+    Returns:
+        (bool): True if char is a letter, False otherwise
+    """
+    return char.isalnum() and not char.isdecimal()
+
+
 def is_probably_hyphenated(previous, current):
     """Find out if previous is part of a hyphenated word.
 
@@ -71,12 +88,12 @@ def is_probably_hyphenated(previous, current):
     Returns:
         (bool): True if previous is part of a hyphenated word, False otherwise
     """
-    previous1 = previous[-2:]
-    current1 = current[:2]
-
     return (
-        LETTER_HYPHEN_AT_END.match(previous1)
-        and LETTER_AT_START.match(current1)
+        len(previous) > 1
+        and previous[-1] == "-"
+        and is_letter(previous[-2])
+        and current != ""
+        and is_letter(current[0])
         and current[0] == current[0].lower()
     )
 
@@ -344,7 +361,8 @@ class PDFPage:
 
         Args:
             skip_pages (list of mixed): list of the pages that should be
-                skipped.
+                skipped. Any container supporting "in" works; a set makes
+                the page number lookup constant time.
 
         Returns:
             (bool): True if this page should be skipped, otherwise false.
@@ -402,34 +420,73 @@ class PDFPage:
             ]
 
     @staticmethod
-    def is_inside_margins(text, margins):
-        """Check if t is inside the given margins.
+    def position(text):
+        """Get the position of a text element.
 
-        t is a text element
+        Args:
+            text (etree.Element): a text element with an inline css style
+
+        Returns:
+            (tuple[int, int]): the top and left position of the element
+        """
+        style = styles(text.get("style"))
+
+        return int(style.get("top")), int(style.get("left"))
+
+    @staticmethod
+    def is_position_inside_margins(position, margins):
+        """Check if position is inside the given margins.
+
+        Args:
+            position (tuple[int, int]): the top and left position of
+                a text element
+            margins (dict): the margins of the page
+
+        Returns:
+            (bool): True if position is inside the margins, False otherwise
         """
         if not margins:
             return False
 
-        style = styles(text.get("style"))
-        top = int(style.get("top"))
-        left = int(style.get("left"))
+        top, left = position
 
         return (
             margins["top_margin"] < top < margins["bottom_margin"]
             and margins["left_margin"] < left < margins["right_margin"]
         )
 
+    @staticmethod
+    def is_inside_margins(text, margins):
+        """Check if t is inside the given margins.
+
+        t is a text element
+        """
+        if not margins:
+            return False
+
+        return PDFPage.is_position_inside_margins(PDFPage.position(text), margins)
+
     def pick_valid_text_elements(self):
         """Pick the wanted text elements from a page.
 
-        This is the main function of this class
+        This is the main function of this class. The style of each
+        paragraph is parsed once, and the position is checked against
+        both the margins and the inner margins.
         """
         margins = self.pdf_pagemetadata.compute_margins()
         inner_margins = self.pdf_pagemetadata.compute_inner_margins()
+        top_margin = margins["top_margin"]
+        bottom_margin = margins["bottom_margin"]
+        left_margin = margins["left_margin"]
+        right_margin = margins["right_margin"]
         for paragraph in self.page_element.iter("p"):
-            if self.is_inside_margins(
-                paragraph, margins
-            ) and not self.is_inside_margins(paragraph, inner_margins):
+            top, left = self.position(paragraph)
+            # Same test as is_position_inside_margins, inlined for the margins.
+            if (
+                top_margin < top < bottom_margin
+                and left_margin < left < right_margin
+                and not self.is_position_inside_margins((top, left), inner_margins)
+            ):
                 yield deepcopy(paragraph)
 
 
@@ -463,12 +520,14 @@ class PDF2XMLConverter(basicconverter.BasicConverter):
         Returns:
             (str): containing the modified version of the document.
         """
-        remove_re = re.compile(f"[\x00-\x08\x0B-\x0C\x0E-\x1F\x7F{extra}]")
+        remove_re = (
+            re.compile(f"[{CONTROL_CHARS}{extra}]") if extra else CONTROL_CHARS_RE
+        )
         content, _ = remove_re.subn("", content)
 
         # Microsoft Word PDF's have Latin-1 file names in links; we
         # don't actually need any link attributes:
-        content = re.sub("<a [^>]+>", "<a>", content)
+        content = LINK_START_RE.sub("<a>", content)
 
         return content
 
@@ -542,14 +601,17 @@ class PDF2XMLConverter(basicconverter.BasicConverter):
         body = etree.SubElement(document, "body")
 
         try:
-            parser = etree.HTMLParser()
-            root_element = etree.fromstring(pdf_content.encode("utf8"), parser=parser)
+            root_element = etree.fromstring(
+                pdf_content.encode("utf8"), parser=HTML_PARSER
+            )
         except etree.XMLSyntaxError as error:
             self.handle_syntaxerror(error, util.lineno(), pdf_content)
 
         this_p = etree.Element("p")
         for paragraph in self.parse_pages(root_element):
-            text = paragraph.xpath("string()").strip()
+            text = etree.tostring(
+                paragraph, method="text", encoding="unicode", with_tail=False
+            ).strip()
             if text:
                 if text[0] != text[0].lower():
                     self.possibly_add_to_body(body, this_p)
@@ -579,37 +641,45 @@ class PDF2XMLConverter(basicconverter.BasicConverter):
         doc.attrib["lang"] = lang
         return etree.tostring(doc, encoding="utf8", method="html", pretty_print=True)
 
-    def parse_page(self, page):
+    def parse_page(self, page, skip_pages, page_metadata):
         """Parse the page element.
 
         Args:
             page (Any): a pdf xml page element.
+            skip_pages (frozenset): the pages that should be skipped.
+            page_metadata (dict): the margins, inner margins and linespacing
+                read from the metadata file, as PDFPage keyword arguments.
         """
-        try:
-            pdfpage = PDFPage(
-                page,
-                metadata_margins=self.metadata.margins,
-                metadata_inner_margins=self.metadata.inner_margins,
-                linespacing=self.metadata.linespacing,
-            )
-            if not pdfpage.is_skip_page(self.metadata.skip_pages):
-                # pdfpage.fix_font_id(self.pdffontspecs)
-                yield from pdfpage.pick_valid_text_elements()
-        except xslsetter.XsltError as error:
-            raise util.ConversionError(str(error))
+        pdfpage = PDFPage(page, **page_metadata)
+        if not pdfpage.is_skip_page(skip_pages):
+            # pdfpage.fix_font_id(self.pdffontspecs)
+            yield from pdfpage.pick_valid_text_elements()
 
     def parse_pages(self, root_element):
         """Parse the pages of the pdf xml document.
 
+        The page metadata is read from the metadata file once per document,
+        not once per page. The picked paragraphs are copies, so each page is
+        cleared as soon as it has been parsed to free its memory.
+
         Args:
             root_element (xml.etree.Element): the root element of the pdf2xml
-                document.
+                document. It is consumed: each page div is cleared after
+                parsing.
         """
-        return (
-            paragraph
-            for page in root_element.xpath('//div[starts-with(@id, "page")]')
-            for paragraph in self.parse_page(page)
-        )
+        try:
+            skip_pages = frozenset(self.metadata.skip_pages)
+            page_metadata = {
+                "metadata_margins": self.metadata.margins,
+                "metadata_inner_margins": self.metadata.inner_margins,
+                "linespacing": self.metadata.linespacing,
+            }
+        except xslsetter.XsltError as error:
+            raise util.ConversionError(str(error))
+
+        for page in PAGE_DIVS(root_element):
+            yield from self.parse_page(page, skip_pages, page_metadata)
+            page.clear()
 
     def add_fontspecs(self, page):
         """Extract font specs found in a pdf2xml page element.
@@ -651,9 +721,8 @@ class PDF2XMLConverter(basicconverter.BasicConverter):
                 print(f"stdout\n{runner.stdout}\n", file=logfile)
                 print(f"stderr\n{runner.stderr}\n", file=logfile)
                 raise util.ConversionError(
-                    "{} failed. More info in the log file: {}".format(
-                        command[0], self.orig + ".log"
-                    )
+                    f"{command[0]} failed. More info in the log file: "
+                    f"{self.orig}.log"
                 )
 
         return runner.stdout.decode("utf8")
@@ -680,7 +749,7 @@ class PDF2XMLConverter(basicconverter.BasicConverter):
             logfile.write(invalid_input)
 
         raise util.ConversionError(
-            "{}: log is found in {}".format(type(self).__name__, self.orig + ".log")
+            f"{type(self).__name__}: log is found in {self.orig}.log"
         )
 
 
@@ -23,8 +23,7 @@ import os
 import unittest
 
 import lxml.etree as etree
-from nose.tools import assert_equal
-from parameterized import parameterized
+import pytest
 
 from corpustools import pdfconverter, xslsetter
 from corpustools.test import xmltester
@@ -32,17 +31,29 @@ from corpustools.test import xmltester
 HERE = os.path.dirname(__file__)
 
 
-@parameterized(
+@pytest.mark.parametrize(
+    "previous, current, wanted",
     [
         ("a-", "b", "a"),
         ("a-", "B", "a-"),
         ("a", "b", "a "),
         ("A", "B", "A "),
         ("a-", "0", "a-"),
-    ]
+    ],
 )
 def test_handle_br(previous, current, wanted):
-    assert_equal(pdfconverter.handle_br(previous, current), wanted)
+    assert pdfconverter.handle_br(previous, current) == wanted
+
+
+def test_merge():
+    first = etree.fromstring("<p>a <b>b</b> c</p>")
+    second = etree.fromstring("<p> d <i>e</i> f</p>")
+
+    got = pdfconverter.merge(first, second)
+
+    assert etree.tostring(got, encoding="unicode") == (
+        "<p>a <b>b</b> c d <i>e</i> f</p>"
+    )
 
 
 class TestPDFFontspecs(unittest.TestCase):
@@ -69,6 +80,14 @@ class TestPDFFontspecs(unittest.TestCase):
 
 
 class TestPDFPageMetaData(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Parse the inner margins shared by the inner margin tests once."""
+        metadata = xslsetter.MetadataHandler("test.pdf.xsl", create=True)
+        metadata.set_variable("inner_top_margin", "1=40")
+        metadata.set_variable("inner_bottom_margin", "1=40")
+        cls.inner_margins = metadata.inner_margins
+
     def test_compute_default_margins(self):
         """Test if the default margins are set."""
         page1 = pdfconverter.PDFPageMetadata(
@@ -181,14 +200,10 @@ class TestPDFPageMetaData(unittest.TestCase):
 
     def test_compute_inner_margins_1(self):
         """Test if inner margins is set for the specified page."""
-        metadata = xslsetter.MetadataHandler("test.pdf.xsl", create=True)
-        metadata.set_variable("inner_top_margin", "1=40")
-        metadata.set_variable("inner_bottom_margin", "1=40")
-
         page1 = pdfconverter.PDFPageMetadata(
             page_id="page1-div",
             page_style="height:1263px;width:862px;",
-            metadata_inner_margins=metadata.inner_margins,
+            metadata_inner_margins=self.inner_margins,
         )
 
         self.assertEqual(
@@ -203,14 +218,10 @@ class TestPDFPageMetaData(unittest.TestCase):
 
     def test_compute_inner_margins_2(self):
         """Test that inner margins is empty for the specified page."""
-        metadata = xslsetter.MetadataHandler("test.pdf.xsl", create=True)
-        metadata.set_variable("inner_top_margin", "1=40")
-        metadata.set_variable("inner_bottom_margin", "1=40")
-
         page1 = pdfconverter.PDFPageMetadata(
             page_id="page2-div",
             page_style="height:1263px;width:862px;",
-            metadata_inner_margins=metadata.inner_margins,
+            metadata_inner_margins=self.inner_margins,
         )
 
         self.assertEqual(page1.compute_inner_margins(), {})
@@ -226,6 +237,19 @@ class TestPDFPageMetaData(unittest.TestCase):
 
 
 class TestPDFPage(xmltester.XMLTester):
+    @classmethod
+    def setUpClass(cls):
+        """Parse the empty pages used by the tests once.
+
+        PDFPage only reads the id and style of these pages.
+        """
+        cls.pages = {
+            number: etree.fromstring(
+                f'<div id="page{number}-div" style="width:862px;height:1263px"/>'
+            )
+            for number in (1, 2, 3)
+        }
+
     def test_is_inside_margins1(self):
         """top and left inside margins."""
         t = etree.fromstring('<p style="top:109px;left:135px"/>')
@@ -235,9 +259,7 @@ class TestPDFPage(xmltester.XMLTester):
         margins["top_margin"] = 88
         margins["bottom_margin"] = 1174
 
-        p2x = pdfconverter.PDFPage(
-            etree.fromstring('<div id="page2-div" style="width:862px;height:1263px"/>')
-        )
+        p2x = pdfconverter.PDFPage(self.pages[2])
 
         self.assertTrue(p2x.is_inside_margins(t, margins))
 
@@ -250,9 +272,7 @@ class TestPDFPage(xmltester.XMLTester):
         margins["top_margin"] = 88
         margins["bottom_margin"] = 1174
 
-        p2x = pdfconverter.PDFPage(
-            etree.fromstring('<div id="page2-div" style="width:862px;height:1263px"/>')
-        )
+        p2x = pdfconverter.PDFPage(self.pages[2])
 
         self.assertFalse(p2x.is_inside_margins(t, margins))
 
@@ -265,9 +285,7 @@ class TestPDFPage(xmltester.XMLTester):
         margins["top_margin"] = 88
         margins["bottom_margin"] = 1174
 
-        p2x = pdfconverter.PDFPage(
-            etree.fromstring('<div id="page2-div" style="width:862px;height:1263px"/>')
-        )
+        p2x = pdfconverter.PDFPage(self.pages[2])
 
         self.assertFalse(p2x.is_inside_margins(t, margins))
 
@@ -280,9 +298,7 @@ class TestPDFPage(xmltester.XMLTester):
         margins["top_margin"] = 88
         margins["bottom_margin"] = 1174
 
-        p2x = pdfconverter.PDFPage(
-            etree.fromstring('<div id="page2-div" style="width:862px;height:1263px"/>')
-        )
+        p2x = pdfconverter.PDFPage(self.pages[2])
 
         self.assertFalse(p2x.is_inside_margins(t, margins))
 
@@ -295,57 +311,74 @@ class TestPDFPage(xmltester.XMLTester):
         margins["top_margin"] = 88
         margins["bottom_margin"] = 1174
 
+        p2x = pdfconverter.PDFPage(self.pages[2])
+
+        self.assertFalse(p2x.is_inside_margins(t, margins))
+
+    def test_pick_valid_text_elements(self):
+        """Only paragraphs inside the margins are picked."""
         p2x = pdfconverter.PDFPage(
-            etree.fromstring('<div id="page2-div" style="width:862px;height:1263px"/>')
+            etree.fromstring(
+                '<div id="page1-div" style="width:862px;height:1263px">'
+                '<p style="position:absolute;top:109px;left:135px">inside</p>'
+                '<p style="position:absolute;top:85px;left:135px">above</p>'
+                '<p style="position:absolute;top:1000px;left:50px">left</p>'
+                "</div>"
+            )
         )
 
-        self.assertFalse(p2x.is_inside_margins(t, margins))
+        self.assertEqual([p.text for p in p2x.pick_valid_text_elements()], ["inside"])
 
-    def test_is_skip_page_1(self):
-        """Odd page should be skipped when odd is in skip_pages."""
+    def test_pick_valid_text_elements_inner_margins(self):
+        """Paragraphs inside the inner margins are not picked."""
         p2x = pdfconverter.PDFPage(
-            etree.fromstring('<div id="page1-div" style="width:862px;height:1263px"/>')
+            etree.fromstring(
+                '<div id="page1-div" style="width:862px;height:1263px">'
+                '<p style="position:absolute;top:109px;left:135px">outside</p>'
+                '<p style="position:absolute;top:600px;left:135px">inner</p>'
+                "</div>"
+            ),
+            metadata_inner_margins={
+                "inner_top_margin": {"1": 40},
+                "inner_bottom_margin": {"1": 40},
+            },
         )
 
+        self.assertEqual([p.text for p in p2x.pick_valid_text_elements()], ["outside"])
+
+    def test_is_skip_page_1(self):
+        """Odd page should be skipped when odd is in skip_pages."""
+        p2x = pdfconverter.PDFPage(self.pages[1])
+
         self.assertTrue(p2x.is_skip_page(["odd"]))
 
     def test_is_skip_page_2(self):
         """Even page should be skipped when even is in skip_pages."""
-        p2x = pdfconverter.PDFPage(
-            etree.fromstring('<div id="page2-div" style="width:862px;height:1263px"/>')
-        )
+        p2x = pdfconverter.PDFPage(self.pages[2])
 
         self.assertTrue(p2x.is_skip_page(["even"]))
 
     def test_is_skip_page_3(self):
         """Even page should not be skipped when odd is in skip_pages."""
-        p2x = pdfconverter.PDFPage(
-            etree.fromstring('<div id="page2-div" style="width:862px;height:1263px"/>')
-        )
+        p2x = pdfconverter.PDFPage(self.pages[2])
 
         self.assertFalse(p2x.is_skip_page(["odd"]))
 
     def test_is_skip_page_4(self):
         """Odd page should not be skipped when even is in skip_pages."""
-        p2x = pdfconverter.PDFPage(
-            etree.fromstring('<div id="page1-div" style="width:862px;height:1263px"/>')
-        )
+        p2x = pdfconverter.PDFPage(self.pages[1])
 
         self.assertFalse(p2x.is_skip_page(["even"]))
 
     def test_is_skip_page_5(self):
         """Page should not be skipped when not in skip_range."""
-        p2x = pdfconverter.PDFPage(
-            etree.fromstring('<div id="page1-div" style="width:862px;height:1263px"/>')
-        )
+        p2x = pdfconverter.PDFPage(self.pages[1])
 
         self.assertFalse(p2x.is_skip_page(["even", 3]))
 
     def test_is_skip_page_6(self):
         """Page should be skipped when in skip_range."""
-        p2x = pdfconverter.PDFPage(
-            etree.fromstring('<div id="page3-div" style="width:862px;height:1263px"/>')
-        )
+        p2x = pdfconverter.PDFPage(self.pages[3])
 
         self.assertTrue(p2x.is_skip_page(["even", 3]))
 
@@ -353,11 +386,64 @@ class TestPDFPage(xmltester.XMLTester):
 class TestPDF2XMLConverter(xmltester.XMLTester):
     """Test the class that converts from pdf2xml to giellatekno/divvun xml."""
 
-    def test_pdf_converter(self):
-        pdfdocument = pdfconverter.PDF2XMLConverter(
+    def setUp(self):
+        """Make a fresh converter, the tests change its metadata."""
+        self.pdfdocument = pdfconverter.PDF2XMLConverter(
             os.path.join(HERE, "converter_data/fakecorpus/orig/sme/riddu/pdf-test.pdf")
         )
-        got = pdfdocument.convert2intermediate()
+
+    def test_parse_pages_skip_pages(self):
+        """Pages listed in skip_pages are left out."""
+        self.pdfdocument.metadata.set_variable("skip_pages", "odd, 2")
+        root_element = etree.fromstring(
+            "<html><body>"
+            + "".join(
+                f'<div id="page{number}-div" style="width:862px;height:1263px">'
+                f'<p style="top:109px;left:200px">page {number}</p>'
+                "</div>"
+                for number in range(1, 5)
+            )
+            + "</body></html>"
+        )
+
+        self.assertEqual(
+            [p.text for p in self.pdfdocument.parse_pages(root_element)], ["page 4"]
+        )
+
+    def test_strip_chars(self):
+        """Control characters and link attributes are removed."""
+        self.assertEqual(
+            pdfconverter.PDF2XMLConverter.strip_chars(
+                '<p>a\x01b\x7fc\td<a href="x">e</a></p>'
+            ),
+            "<p>abc\td<a>e</a></p>",
+        )
+
+    def test_parse_pages(self):
+        """Margins from the metadata file apply to every page."""
+        self.pdfdocument.metadata.set_variable("left_margin", "all=20")
+        root_element = etree.fromstring(
+            "<html><body>"
+            '<div id="page1-div" style="width:862px;height:1263px">'
+            '<p style="top:109px;left:135px">left of margin</p>'
+            '<p style="top:129px;left:200px">page 1</p>'
+            "</div>"
+            '<div id="page2-div" style="width:862px;height:1263px">'
+            '<p style="top:109px;left:200px">page 2</p>'
+            "</div>"
+            "</body></html>"
+        )
+
+        pages = pdfconverter.PAGE_DIVS(root_element)
+
+        self.assertEqual(
+            [p.text for p in self.pdfdocument.parse_pages(root_element)],
+            ["page 1", "page 2"],
+        )
+        self.assertEqual([len(page) for page in pages], [0, 0])
+
+    def test_pdf_converter(self):
+        got = self.pdfdocument.convert2intermediate()
         want = etree.parse(os.path.join(HERE, "converter_data/pdf-xml2pdf-test.xml"))
 
         self.assertXmlEqual(got, want)
@@ -0,0 +1,42 @@
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this file. If not, see <http://www.gnu.org/licenses/>.
+#
+#   Copyright © 2014-2023 The University of Tromsø &
+#                         the Norwegian Sámi Parliament
+#   http://giellatekno.uit.no & http://divvun.no
+#
+"""Test the XMLTester class."""
+
+import lxml.etree as etree
+
+from corpustools.test import xmltester
+
+
+class TestXMLTester(xmltester.XMLTester):
+    """Test the XMLTester class."""
+
+    def test_assert_xml_equal(self):
+        """Equal elements pass."""
+        self.assertXmlEqual(
+            etree.fromstring("<r><p>x</p>t</r>")[0],
+            etree.fromstring("<r><p>x</p>t</r>")[0],
+        )
+
+    def test_assert_xml_equal_tail(self):
+        """Elements that only differ in their tail do not pass."""
+        with self.assertRaises(AssertionError):
+            self.assertXmlEqual(
+                etree.fromstring("<r><p>x</p>t1</r>")[0],
+                etree.fromstring("<r><p>x</p>t2</r>")[0],
+            )
@@ -26,6 +26,15 @@ from corpustools import xslsetter
 class TestMetadataHandler(unittest.TestCase):
     """Test the MetadataHandler class."""
 
+    def test_create_from_template(self):
+        """Handlers created from the template do not share their tree."""
+        md1 = xslsetter.MetadataHandler("bogus.pdf", create=True)
+        md2 = xslsetter.MetadataHandler("bogus.pdf", create=True)
+        md1.set_variable("skip_pages", "1")
+
+        self.assertEqual(md1.get_variable("skip_pages"), "1")
+        self.assertIsNone(md2.get_variable("skip_pages"))
+
     def test_set_skip_lines1(self):
         """Test a valid skip_pages line."""
         md = xslsetter.MetadataHandler("bogus.pdf", create=True)
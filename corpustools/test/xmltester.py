@@ -32,6 +32,10 @@ class XMLTester(unittest.TestCase):
     def assertXmlEqual(got, want):
         """Check if two stringified xml snippets are equal.
 
+        Identical canonical (C14N 2.0) serialisations with identical tails
+        are accepted right away. Otherwise the snippets are compared with the more lenient
+        LXMLOutputChecker, which also produces the error message.
+
         Args:
             got (etree.Element): the xml part given by the tester
             want (etree.Element): the wanted xml
@@ -39,6 +43,11 @@ class XMLTester(unittest.TestCase):
         Raises:
             AssertionError: If they are not equal
         """
+        if etree.tostring(got, method="c14n2") == etree.tostring(
+            want, method="c14n2"
+        ) and getattr(got, "tail", None) == getattr(want, "tail", None):
+            return
+
         got = etree.tostring(got, encoding="unicode")
         want = etree.tostring(want, encoding="unicode")
 
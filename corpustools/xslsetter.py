@@ -18,9 +18,11 @@
 """Get and set metadata in metadata files."""
 
 
+import functools
 import os
 import re
 import sys
+from copy import deepcopy
 
 import lxml.etree as etree
 
@@ -29,6 +31,19 @@ from corpustools import corpuspath, util
 here = os.path.dirname(__file__)
 
 
+@functools.lru_cache(maxsize=1)
+def template_tree():
+    """Parse the metadata template file.
+
+    The template is parsed only once. Use a copy of the returned tree,
+    never the tree itself.
+
+    Returns:
+        (etree._ElementTree): the parsed XSL-template.xsl file
+    """
+    return etree.parse(os.path.join(here, "xslt/XSL-template.xsl"))
+
+
 class XsltError(Exception):
     """Raise this exception when errors arise in this module."""
 
@@ -67,7 +82,7 @@ class MetadataHandler:
         if not os.path.exists(filename):
             if not create:
                 raise util.ArgumentError(f"{filename} does not exist!")
-            self.tree = etree.parse(os.path.join(here, "xslt/XSL-template.xsl"))
+            self.tree = deepcopy(template_tree())
         else:
             try:
                 self.tree = etree.parse(filename)